@@ -15,7 +15,6 @@ from collections import namedtuple
 print("Starting!")
 
 
-Point2D = namedtuple('Point2D', 'x y')
 GCodeLine = namedtuple('GCodeLine', 'x y z e f')
 
 
@@ -69,10 +68,6 @@ for x, z in coordinates:
     print(f'{x},{z}')
 
 
-def getNormalPoint(currentPoint: Point2D, derivative: float, distance: float) -> Point2D: #claculates the normal of a point on the spline
-    angle = np.arctan(derivative) + math.pi /2
-    return Point2D(currentPoint.x + distance * np.cos(angle), currentPoint.y + distance * np.sin(angle))
-
 def parseGCode(currentLine: str) -> GCodeLine: #parse a G-Code line
     thisLine = re.compile('(?i)^[gG][0-3](?:\s+x(?P<x>-?[0-9.]{1,15})|\s+y(?P<y>-?[0-9.]{1,15})|\s+z(?P<z>-?[0-9.]{1,15})|\s+e(?P<e>-?[0-9.]{1,15})|\s+f(?P<f>-?[0-9.]{1,15}))*')
     lineEntries = thisLine.match(currentLine)
@@ -102,7 +97,7 @@ def createSplineLookupTable():
     
 
 
-lastPosition = Point2D(0, 0)
+lastX = 0.0
 currentZ = 0.0
 lastZ = 0.0
 currentLayer = 0
@@ -111,14 +106,15 @@ createSplineLookupTable()
 
 with open(INPUT_FILE_NAME, "r") as gcodeFile, open(OUTPUT_FILE_NAME, "w+") as outputFile:
         for currentLine in gcodeFile:
-            if currentLine[0] == ";":   #if NOT a comment
+            lineStart = currentLine[:4]
+            if lineStart.startswith(";"):   #if NOT a comment
                 outputFile.write(currentLine)
                 continue
-            if currentLine.find("G91 ") != -1:   #filter relative commands
+            if lineStart == "G91 ":   #filter relative commands
                 relativeMode = True
                 outputFile.write(currentLine)
                 continue
-            if currentLine.find("G90 ") != -1:   #set absolute mode
+            if lineStart == "G90 ":   #set absolute mode
                 relativeMode = False
                 outputFile.write(currentLine)
                 continue
@@ -140,28 +136,33 @@ with open(INPUT_FILE_NAME, "r") as gcodeFile, open(OUTPUT_FILE_NAME, "w+") as ou
                         continue
                     outputFile.write(currentLine)
                     continue
-                currentPosition = Point2D(float(currentLineCommands.x), float(currentLineCommands.y))
-                midpointX = lastPosition.x + (currentPosition.x - lastPosition.x) / 2  #look for midpoint
+                currentX = float(currentLineCommands.x)
+                currentY = float(currentLineCommands.y)
+                midpointX = lastX + (currentX - lastX) / 2  #look for midpoint
                 
                 distToSpline = midpointX - SPLINE_X[0]
                 
                 #Correct the z-height if the spline gets followed
                 correctedZHeight = onSplineLength(currentZ)
                                 
-                angleSplineThisLayer = np.arctan(SPLINE(correctedZHeight, 1)) #inclination angle this layer
+                splineDerivative = float(SPLINE(correctedZHeight, 1))
+                angleSplineThisLayer = np.arctan(splineDerivative) #inclination angle this layer
                 
                 angleLastLayer = np.arctan(SPLINE(correctedZHeight - LAYER_HEIGHT, 1)) # inclination angle previous layer
                 
                 heightDifference = np.sin(angleSplineThisLayer - angleLastLayer) * distToSpline * -1 # layer height difference
                 
-                transformedGCode = getNormalPoint(Point2D(correctedZHeight, SPLINE(correctedZHeight)), SPLINE(correctedZHeight, 1), currentPosition.x - SPLINE_X[0])
+                #Point on the normal of the spline, x is the new height and y the new X position
+                normalAngle = angleSplineThisLayer + math.pi / 2
+                transformedZ = correctedZHeight + (currentX - SPLINE_X[0]) * math.cos(normalAngle)
+                transformedX = float(SPLINE(correctedZHeight)) + (currentX - SPLINE_X[0]) * math.sin(normalAngle)
                 
                 #Check if a move is below Z = 0
-                if float(transformedGCode.x) <= 0.0: 
+                if transformedZ <= 0.0: 
                     print("Warning! Movement below build platform. Check your spline!")
                 
                 #Detect unplausible moves
-                if transformedGCode.x < 0 or np.abs(transformedGCode.x - currentZ) > 50:
+                if transformedZ < 0 or abs(transformedZ - currentZ) > 50:
                     print("Warning! Possibly unplausible move detected on height " + str(currentZ) + " mm!")
                     outputFile.write(currentLine)
                     continue    
@@ -181,8 +182,8 @@ with open(INPUT_FILE_NAME, "r") as gcodeFile, open(OUTPUT_FILE_NAME, "w+") as ou
                 else:
                     extrusionAmount = None                
                 Baxis = angleSplineThisLayer * 57.2958 #radians to degrees
-                writeLine(1,transformedGCode.y, currentPosition.y, transformedGCode.x, Baxis, None, extrusionAmount)
-                lastPosition = currentPosition
+                writeLine(1, transformedX, currentY, transformedZ, Baxis, None, extrusionAmount)
+                lastX = currentX
                 lastZ = currentZ
             else:
                 outputFile.write(currentLine)
@@ -0,0 +1,256 @@
+import re
+import math
+import threading
+from array import array
+import numpy as np
+
+# Numba is optional: without it the kernels below run as plain Python
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Line kinds produced by the G-code pre-parse
+LINE_OTHER = 0
+LINE_COMMENT = 1
+LINE_RELATIVE = 2
+LINE_ABSOLUTE = 3
+LINE_MOVE = 4
+
+# G0-G3 moves with their X/Y/Z/E/F fields, matched over the whole file at once
+GCODE_MOVE_PATTERN = re.compile(r'(?im)^g[0-3](?:[^\S\n]+x(?P<x>-?[0-9.]{1,15})|[^\S\n]+y(?P<y>-?[0-9.]{1,15})|[^\S\n]+z(?P<z>-?[0-9.]{1,15})|[^\S\n]+e(?P<e>-?[0-9.]{1,15})|[^\S\n]+f(?P<f>-?[0-9.]{1,15}))*')
+COMMENT_PATTERN = re.compile(r'(?m)^;')
+RELATIVE_PATTERN = re.compile(r'(?m)^G91 ')
+ABSOLUTE_PATTERN = re.compile(r'(?m)^G90 ')
+
+# What the writer has to do with each line
+ACTION_COPY = 0
+ACTION_Z_MOVE = 1
+ACTION_BEND = 2
+
+# Warning flags raised by the bending kernel
+WARN_SPLINE_TOO_SHORT = 1
+WARN_BELOW_PLATFORM = 2
+WARN_UNPLAUSIBLE = 4
+WARN_SELF_INTERSECTION = 8
+WARN_ANGLE = 16
+
+
+def spline_coefficients(spline):
+    """Return the raw (coefficients, breakpoints) arrays of a scipy CubicSpline"""
+    return np.ascontiguousarray(spline.c, dtype=np.float64), np.ascontiguousarray(spline.x, dtype=np.float64)
+
+
+def parse_gcode_lines(lines):
+    """Parse G-code lines into a kind array and X/Y/Z/E/F float arrays (NaN for missing fields)"""
+    text = "".join(lines)
+    line_lengths = np.fromiter(map(len, lines), dtype=np.int64, count=len(lines))
+    line_starts = np.cumsum(line_lengths) - line_lengths
+
+    def line_indices(positions):
+        positions = np.fromiter(positions, dtype=np.int64)
+        return np.searchsorted(line_starts, positions, side='right') - 1
+
+    kinds = np.full(len(lines), LINE_OTHER, dtype=np.int8)
+    columns = tuple(np.full(len(lines), np.nan) for _ in range(5))
+
+    # One pass over the moves, only their start offsets and X/Y/Z/E/F values are kept
+    move_starts = array('q')
+    move_fields = array('d')
+    for match in GCODE_MOVE_PATTERN.finditer(text):
+        move_starts.append(match.start())
+        move_fields.extend(map(float, match.groups("nan")))
+    move_indices = line_indices(move_starts)
+    kinds[move_indices] = LINE_MOVE
+    move_fields = np.frombuffer(move_fields, dtype=np.float64).reshape(-1, 5)
+    for j, column in enumerate(columns):
+        column[move_indices] = move_fields[:, j]
+
+    # Later assignments take precedence, same order as the checks in the bending loop
+    kinds[line_indices(match.start() for match in ABSOLUTE_PATTERN.finditer(text))] = LINE_ABSOLUTE
+    kinds[line_indices(match.start() for match in RELATIVE_PATTERN.finditer(text))] = LINE_RELATIVE
+    kinds[line_indices(match.start() for match in COMMENT_PATTERN.finditer(text))] = LINE_COMMENT
+
+    return (kinds,) + columns
+
+
+@njit(cache=True)
+def _spline_interval(breaks, z):
+    i = np.searchsorted(breaks, z, side='right') - 1
+    if i < 0:
+        return 0
+    if i > len(breaks) - 2:
+        return len(breaks) - 2
+    return i
+
+
+@njit(cache=True)
+def eval_spline(c, breaks, z):
+    """Evaluate the piecewise cubic at z (extrapolates like CubicSpline)"""
+    i = _spline_interval(breaks, z)
+    dz = z - breaks[i]
+    return ((c[0, i] * dz + c[1, i]) * dz + c[2, i]) * dz + c[3, i]
+
+
+@njit(cache=True)
+def eval_spline_derivative(c, breaks, z):
+    """Evaluate the first derivative of the piecewise cubic at z"""
+    i = _spline_interval(breaks, z)
+    dz = z - breaks[i]
+    return (3.0 * c[0, i] * dz + 2.0 * c[1, i]) * dz + c[2, i]
+
+
+@njit(cache=True, nogil=True)
+def build_lut(c, breaks, z_end, dz):
+    """Cumulative spline length at every multiple of dz below z_end, starting at 0"""
+    n = max(int(math.ceil((z_end - dz) / dz)), 0)
+    lut = np.empty(n + 1)
+    lut[0] = 0.0
+    prev = eval_spline(c, breaks, 0.0)
+    for i in range(1, n + 1):
+        value = eval_spline(c, breaks, i * dz)
+        lut[i] = lut[i - 1] + math.sqrt((value - prev) * (value - prev) + dz * dz)
+        prev = value
+    return lut
+
+
+@njit(cache=True, parallel=True)
+def jit_bend_kernel(kinds, xs, ys, zs, es, c, breaks, layer_height, spline_x0, disc_len, lut, warning_angle):
+    """Bend all parsed G-code lines along the spline.
+
+    Returns per-line actions, warning flags, the transformed X/Y/Z, the B axis angle,
+    the scaled extrusion and the Z height every move was processed at. For Z-only
+    moves the relative Z step is stored in the Z output.
+    """
+    n = len(kinds)
+    actions = np.zeros(n, dtype=np.int8)
+    flags = np.zeros(n, dtype=np.int8)
+    out_x = np.full(n, np.nan)
+    out_y = np.full(n, np.nan)
+    out_z = np.full(n, np.nan)
+    out_b = np.full(n, np.nan)
+    out_e = np.full(n, np.nan)
+    current_zs = np.full(n, np.nan)
+    last_xs = np.zeros(n)
+    height_factors = np.zeros(n)
+
+    # Sequential scan: track relative mode and the current Z height of every move
+    relative_mode = False
+    current_z = 0.0
+    for i in range(n):
+        kind = kinds[i]
+        if kind == LINE_RELATIVE:
+            relative_mode = True
+        elif kind == LINE_ABSOLUTE:
+            relative_mode = False
+        elif kind == LINE_MOVE and not relative_mode:
+            if not np.isnan(zs[i]):
+                current_z = zs[i]
+            current_zs[i] = current_z
+            if not (np.isnan(xs[i]) or np.isnan(ys[i])):
+                actions[i] = ACTION_BEND
+            elif not np.isnan(zs[i]):
+                actions[i] = ACTION_Z_MOVE
+
+    # Transform every XY move independently
+    for i in prange(n):
+        if actions[i] != ACTION_BEND:
+            continue
+        current_z = current_zs[i]
+
+        # Follow the spline length to find the corrected Z height, interpolating
+        # linearly between the lookup table samples at multiples of disc_len
+        j = np.searchsorted(lut, current_z)
+        if j == len(lut):
+            flags[i] |= WARN_SPLINE_TOO_SHORT
+            corrected_z = current_z
+        elif j == 0:
+            corrected_z = 0.0
+        else:
+            corrected_z = (j - 1 + (current_z - lut[j - 1]) / (lut[j] - lut[j - 1])) * disc_len
+
+        derivative = eval_spline_derivative(c, breaks, corrected_z)
+        derivative_last_layer = eval_spline_derivative(c, breaks, corrected_z - layer_height)
+        angle_this_layer = math.atan(derivative)
+
+        normal_angle = angle_this_layer + math.pi / 2
+        distance = xs[i] - spline_x0
+        transformed_x = corrected_z + distance * math.cos(normal_angle)
+        transformed_y = eval_spline(c, breaks, corrected_z) + distance * math.sin(normal_angle)
+
+        if transformed_x <= 0.0:
+            flags[i] |= WARN_BELOW_PLATFORM
+
+        if transformed_x < 0 or abs(transformed_x - current_z) > 50:
+            flags[i] |= WARN_UNPLAUSIBLE
+            actions[i] = ACTION_COPY
+            continue
+
+        if angle_this_layer > warning_angle:
+            flags[i] |= WARN_ANGLE
+
+        out_x[i] = transformed_y
+        out_y[i] = ys[i]
+        out_z[i] = transformed_x
+        out_b[i] = angle_this_layer * 57.2958  # radians to degrees
+        # sin(atan(d1) - atan(d2)) = (d1 - d2) / sqrt((1 + d1^2) * (1 + d2^2))
+        height_factors[i] = (derivative - derivative_last_layer) / math.sqrt(
+            (1.0 + derivative * derivative) * (1.0 + derivative_last_layer * derivative_last_layer))
+
+    # Sequential scan: previous X of every bent move and relative steps of Z-only moves
+    last_x = 0.0
+    last_z = 0.0
+    for i in range(n):
+        if actions[i] == ACTION_BEND:
+            last_xs[i] = last_x
+            last_x = xs[i]
+            last_z = current_zs[i]
+        elif actions[i] == ACTION_Z_MOVE:
+            out_z[i] = current_zs[i] - last_z
+            last_z = current_zs[i]
+
+    # Scale the extrusion by the local layer height
+    for i in prange(n):
+        if actions[i] != ACTION_BEND:
+            continue
+        midpoint_x = last_xs[i] + (xs[i] - last_xs[i]) / 2
+        dist_to_spline = midpoint_x - spline_x0
+        height_difference = height_factors[i] * dist_to_spline * -1
+
+        if (layer_height + height_difference) < 0:
+            flags[i] |= WARN_SELF_INTERSECTION
+
+        out_e[i] = es[i] * ((layer_height + height_difference) / layer_height)
+
+    return actions, flags, out_x, out_y, out_z, out_b, out_e, current_zs
+
+
+# Pick the fastest available backend: the ahead-of-time compiled numba module
+# (see build_kernels.py) so the first run does not wait for the JIT compiler,
+# then numba JIT, then the Cython extension (see setup.py), then plain Python
+try:
+    from gcode_kernels import bend_kernel
+    KERNEL_BACKEND = "numba-aot"
+except ImportError:
+    if NUMBA_AVAILABLE:
+        bend_kernel = jit_bend_kernel
+        KERNEL_BACKEND = "numba"
+    else:
+        try:
+            from bend_kernels_cy import bend_kernel
+            KERNEL_BACKEND = "cython"
+        except ImportError:
+            bend_kernel = jit_bend_kernel
+            KERNEL_BACKEND = "python"
+
+# Numba's parallel runtime must not be entered from two threads at once (the workqueue
+# threading layer aborts the process), so callers hold this lock around bend_kernel
+KERNEL_LOCK = threading.Lock()
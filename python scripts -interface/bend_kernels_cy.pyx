@@ -0,0 +1,173 @@
+# cython: language_level=3
+"""
+Cython build of the bending kernel for installs without numba.
+
+Build with:
+    python setup.py build_ext --inplace
+Same inputs and outputs as bend_kernels.jit_bend_kernel.
+"""
+
+import numpy as np
+cimport cython
+from libc.math cimport atan, sin, cos, sqrt, fabs, isnan, M_PI, NAN
+
+# Mirrors the constants in bend_kernels.py
+cdef enum:
+    LINE_RELATIVE = 2
+    LINE_ABSOLUTE = 3
+    LINE_MOVE = 4
+
+    ACTION_COPY = 0
+    ACTION_Z_MOVE = 1
+    ACTION_BEND = 2
+
+    WARN_SPLINE_TOO_SHORT = 1
+    WARN_BELOW_PLATFORM = 2
+    WARN_UNPLAUSIBLE = 4
+    WARN_SELF_INTERSECTION = 8
+    WARN_ANGLE = 16
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef Py_ssize_t spline_interval(const double[:] breaks, double z) noexcept nogil:
+    # Bisect for the last breakpoint <= z, clamped to the first and last segment
+    cdef Py_ssize_t lo = 0, hi = breaks.shape[0] - 2, mid
+    if z < breaks[1]:
+        return 0
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if breaks[mid] <= z:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double eval_spline(const double[:, :] c, const double[:] breaks, double z) noexcept nogil:
+    cdef Py_ssize_t i = spline_interval(breaks, z)
+    cdef double dz = z - breaks[i]
+    return ((c[0, i] * dz + c[1, i]) * dz + c[2, i]) * dz + c[3, i]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double eval_spline_derivative(const double[:, :] c, const double[:] breaks, double z) noexcept nogil:
+    cdef Py_ssize_t i = spline_interval(breaks, z)
+    cdef double dz = z - breaks[i]
+    return (3.0 * c[0, i] * dz + 2.0 * c[1, i]) * dz + c[2, i]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef Py_ssize_t lookup_index(const double[:] lut, double z) noexcept nogil:
+    # Index of the first table entry >= z (len(lut) when there is none)
+    cdef Py_ssize_t lo = 0, hi = lut.shape[0], mid
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if lut[mid] < z:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def bend_kernel(const signed char[:] kinds, const double[:] xs, const double[:] ys, const double[:] zs,
+                const double[:] es, const double[:, :] c, const double[:] breaks, double layer_height,
+                double spline_x0, double disc_len, const double[:] lut, double warning_angle):
+    """Bend all parsed G-code lines along the spline (see bend_kernels.jit_bend_kernel)"""
+    cdef Py_ssize_t n = kinds.shape[0], i, j
+    actions_array = np.zeros(n, dtype=np.int8)
+    flags_array = np.zeros(n, dtype=np.int8)
+    out_x_array, out_y_array, out_z_array, out_b_array, out_e_array, current_zs_array = (
+        np.full(n, np.nan) for _ in range(6))
+    cdef signed char[:] actions = actions_array
+    cdef signed char[:] flags = flags_array
+    cdef double[:] out_x = out_x_array
+    cdef double[:] out_y = out_y_array
+    cdef double[:] out_z = out_z_array
+    cdef double[:] out_b = out_b_array
+    cdef double[:] out_e = out_e_array
+    cdef double[:] current_zs = current_zs_array
+
+    cdef bint relative_mode = False
+    cdef double last_x = 0.0, current_z = 0.0, last_z = 0.0
+    cdef double corrected_z, derivative, derivative_last_layer, angle_this_layer
+    cdef double normal_angle, distance, transformed_x, transformed_y, height_difference
+    cdef Py_ssize_t lut_length = lut.shape[0]
+
+    with nogil:
+        for i in range(n):
+            if kinds[i] == LINE_RELATIVE:
+                relative_mode = True
+                continue
+            if kinds[i] == LINE_ABSOLUTE:
+                relative_mode = False
+                continue
+            if relative_mode or kinds[i] != LINE_MOVE:
+                continue
+
+            if not isnan(zs[i]):
+                current_z = zs[i]
+            current_zs[i] = current_z
+
+            if isnan(xs[i]) or isnan(ys[i]):
+                if not isnan(zs[i]):
+                    actions[i] = ACTION_Z_MOVE
+                    out_z[i] = current_z - last_z
+                    last_z = current_z
+                continue
+
+            # Follow the spline length to find the corrected Z height
+            j = lookup_index(lut, current_z)
+            if j == lut_length:
+                flags[i] |= WARN_SPLINE_TOO_SHORT
+                corrected_z = current_z
+            elif j == 0:
+                corrected_z = 0.0
+            else:
+                corrected_z = (j - 1 + (current_z - lut[j - 1]) / (lut[j] - lut[j - 1])) * disc_len
+
+            derivative = eval_spline_derivative(c, breaks, corrected_z)
+            derivative_last_layer = eval_spline_derivative(c, breaks, corrected_z - layer_height)
+            angle_this_layer = atan(derivative)
+
+            normal_angle = angle_this_layer + M_PI / 2
+            distance = xs[i] - spline_x0
+            transformed_x = corrected_z + distance * cos(normal_angle)
+            transformed_y = eval_spline(c, breaks, corrected_z) + distance * sin(normal_angle)
+
+            if transformed_x <= 0.0:
+                flags[i] |= WARN_BELOW_PLATFORM
+
+            if transformed_x < 0 or fabs(transformed_x - current_z) > 50:
+                flags[i] |= WARN_UNPLAUSIBLE
+                continue
+
+            height_difference = ((derivative - derivative_last_layer) / sqrt(
+                (1.0 + derivative * derivative) * (1.0 + derivative_last_layer * derivative_last_layer))
+                * ((last_x + (xs[i] - last_x) / 2) - spline_x0) * -1)
+
+            if (layer_height + height_difference) < 0:
+                flags[i] |= WARN_SELF_INTERSECTION
+
+            if angle_this_layer > warning_angle:
+                flags[i] |= WARN_ANGLE
+
+            actions[i] = ACTION_BEND
+            out_x[i] = transformed_y
+            out_y[i] = ys[i]
+            out_z[i] = transformed_x
+            out_b[i] = angle_this_layer * 57.2958  # radians to degrees
+            out_e[i] = es[i] * ((layer_height + height_difference) / layer_height)
+
+            last_x = xs[i]
+            last_z = current_z
+
+    return (actions_array, flags_array, out_x_array, out_y_array, out_z_array, out_b_array,
+            out_e_array, current_zs_array)
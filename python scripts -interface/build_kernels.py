@@ -0,0 +1,26 @@
+"""
+Ahead-of-time compile the bending kernel into the gcode_kernels extension module.
+
+Run once after installing numba:
+    python build_kernels.py
+bend_kernels.py picks the compiled module up automatically and falls back to the
+JIT version when it is missing.
+"""
+
+import os
+from numba.pycc import CC
+
+from bend_kernels import jit_bend_kernel
+
+BEND_KERNEL_SIGNATURE = (
+    "Tuple((i1[:], i1[:], f8[:], f8[:], f8[:], f8[:], f8[:], f8[:]))"
+    "(i1[:], f8[:], f8[:], f8[:], f8[:], f8[:, :], f8[:], f8, f8, f8, f8[:], f8)"
+)
+
+cc = CC('gcode_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+cc.export('bend_kernel', BEND_KERNEL_SIGNATURE)(jit_bend_kernel.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"✅ Done! Compiled kernels saved to: {cc.output_dir}")
@@ -1,23 +1,29 @@
 import sys
 import os
+import io
 import re
+import json
 import math
-import subprocess
+import mmap
+import functools
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, compress, repeat
 import numpy as np
 
 # Set matplotlib backend before importing pyplot
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend to avoid Qt conflicts
-import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
 from scipy.interpolate import CubicSpline
-from collections import namedtuple
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
                              QGridLayout, QWidget, QPushButton, QLabel, QLineEdit, 
                              QTextEdit, QFileDialog, QGroupBox, QMessageBox, QProgressBar)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtGui import QFont, QPixmap, QShortcut, QKeySequence
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QUrl, pyqtSignal, QTimer
+from PyQt6.QtGui import QFont, QImage, QPixmap, QShortcut, QKeySequence, QDesktopServices
 from PyQt6.QtWidgets import QLabel as QImageLabel
 
 # Try to import PyQt6 matplotlib backend, fallback to image display
@@ -34,9 +40,157 @@ try:
 except ImportError:
     KLIPPER_AVAILABLE = False
 
-# Define namedtuples
-Point2D = namedtuple('Point2D', 'x y')
-GCodeLine = namedtuple('GCodeLine', 'x y z e f')
+# Qt's websocket module is optional: without it the printer status is read once instead of pushed
+try:
+    from PyQt6.QtWebSockets import QWebSocket
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+# Import the bending kernels (numba-compiled when numba is installed)
+from bend_kernels import (KERNEL_LOCK, bend_kernel, build_lut, parse_gcode_lines, spline_coefficients, ACTION_Z_MOVE, ACTION_BEND,
+                          WARN_SPLINE_TOO_SHORT, WARN_BELOW_PLATFORM, WARN_UNPLAUSIBLE,
+                          WARN_SELF_INTERSECTION, WARN_ANGLE)
+
+# Klipper conversion, shared with the standalone converter script
+from klipper_converter import convert_lines
+
+# IK translation pattern: X/Y/Z/A/B words of a G-code line
+IK_AXIS_PATTERN = re.compile(rb"(?<!\S)([XYZAB])(-?[0-9.]+)(?!\S)")
+
+# Number of output lines collected before they are written out in one call
+OUTPUT_BUFFER_LINES = 1 << 14
+# Size of the line-aligned blocks the IK translation works on (bytes)
+IK_BLOCK_BYTES = 1 << 20
+# Write buffer of the Klipper output file (bytes)
+OUTPUT_BUFFER_BYTES = 1 << 20
+# Minimum time between two batches of log lines sent to / shown in the GUI (seconds)
+LOG_EMIT_INTERVAL = 0.05
+# Delay before the busy indicator is shown, so tasks that finish quickly do not make it flicker (ms)
+PROGRESS_DELAY_MS = 150
+# Timeout for the batched setup scripts (seconds): Moonraker answers only after their moves are done
+SETUP_SCRIPT_TIMEOUT = 120
+# Number of queued worker log lines that are sent right away without waiting for the interval
+LOG_EMIT_LINES = 100
+
+@functools.lru_cache(maxsize=8)
+def _make_spline(spline_x, spline_z):
+    """Build the bending spline; cached because preview and bending use the same control points"""
+    return CubicSpline(spline_z, spline_x, bc_type=((1, 0), (1, 2.5)))
+
+def format_line(g, x, y, z, a, f=None, e=None):
+    """Format one bent G-code move"""
+    return (f"G{int(g)} X{x:.5f} Y{y:.5f} Z{z:.3f} A0 B{a:.3f}"
+            f"{f' E{float(e):.5f}' if e is not None else ''}{f' F{int(float(f))}' if f is not None else ''}\n")
+
+def bent_chunks(lines, actions, fs, out_x, out_y, out_z, out_b, out_e):
+    """Yield the bent G-code text for the bending kernel results, in chunks of OUTPUT_BUFFER_LINES input lines"""
+    # Only the current block of the result columns is converted to Python floats
+    out_buf = []
+    # Consecutive Z-only moves with the same (or no) feedrate share one relative move
+    pending_dz = None
+    pending_feedrate = ""
+    for start in range(0, len(lines), OUTPUT_BUFFER_LINES):
+        stop = start + OUTPUT_BUFFER_LINES
+        block_actions, block_x, block_y, block_z, block_b, block_e, block_f = (
+            column[start:stop].tolist() for column in (actions, out_x, out_y, out_z, out_b, out_e, fs))
+        for i, current_line in enumerate(lines[start:stop]):
+            action = block_actions[i]
+            if action == ACTION_Z_MOVE:
+                feedrate = "" if math.isnan(block_f[i]) else f" F{block_f[i]:g}"
+                if pending_dz is not None and feedrate in ("", pending_feedrate):
+                    pending_dz += block_z[i]
+                    continue
+            if pending_dz is not None:
+                out_buf.append(f"G91\nG1 Z{pending_dz}{pending_feedrate}\nG90\nM83\n")
+                pending_dz = None
+            
+            if action == ACTION_BEND:
+                extrusion_amount = None if math.isnan(block_e[i]) else block_e[i]
+                out_buf.append(format_line(1, block_x[i], block_y[i], block_z[i], block_b[i], None, extrusion_amount))
+            elif action == ACTION_Z_MOVE:
+                pending_dz = block_z[i]
+                pending_feedrate = feedrate
+            else:
+                out_buf.append(current_line)
+        
+        yield "".join(out_buf)
+        out_buf.clear()
+    if pending_dz is not None:
+        yield f"G91\nG1 Z{pending_dz}{pending_feedrate}\nG90\nM83\n"
+
+@contextmanager
+def open_mapped(path):
+    """Memory-map a file read-only (empty files give b"" since they cannot be mapped)"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+
+def read_gcode_file(path):
+    """Read a G-code file and pre-parse it into float arrays (NaN for missing fields)"""
+    with open(path, "r") as gcode_file:
+        lines = gcode_file.readlines()
+    return lines, parse_gcode_lines(lines)
+
+def first_byte_of_lines(data):
+    """Return the first byte of every line in a bytes-like buffer"""
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    line_starts = np.concatenate(([0], np.flatnonzero(buffer == ord("\n")) + 1))
+    return buffer[line_starts[line_starts < len(buffer)]]
+
+def line_blocks(data, size=IK_BLOCK_BYTES):
+    """Yield a bytes-like buffer in blocks of about size bytes, each ending after a line break"""
+    start = 0
+    length = len(data)
+    while start < length:
+        end = length
+        if start + size < length:
+            end = data.rfind(b"\n", start, start + size) + 1
+            if end == 0:
+                # A single line longer than size is kept whole
+                end = data.find(b"\n", start + size) + 1 or length
+        yield data[start:end]
+        start = end
+
+def translate_ik_block(data):
+    """Apply the IK correction to a line-aligned bytes-like block of G-code and return the translated block"""
+    La = 28.4
+    Lb = 47.7
+    
+    # First pass: split the block into [text, axis, value, text, axis, value, ..., text]
+    # and collect the X/Y/Z/A/B values of all G and M lines into columns
+    first_bytes = first_byte_of_lines(data)
+    parts = IK_AXIS_PATTERN.split(data)
+    is_command = (first_bytes == ord("G")) | (first_bytes == ord("M"))
+    word_lines = np.cumsum(np.fromiter(map(bytes.count, parts[0:-1:3], repeat(b"\n")), dtype=np.int64))
+    word_axes = np.array(parts[1::3], dtype='S1')
+    is_command_word = is_command[word_lines]
+    # Only G/M words are numbers, comment lines may contain things like "Z." as text
+    word_values = np.zeros(len(word_axes))
+    word_values[is_command_word] = np.array(list(compress(parts[2::3], is_command_word)), dtype=np.float64)
+    
+    x, y, z, a, b = (np.zeros(len(first_bytes)) for _ in range(5))
+    for column, axis in zip((x, y, z, a, b), (b"X", b"Y", b"Z", b"A", b"B")):
+        selected = is_command_word & (word_axes == axis)
+        column[word_lines[selected]] = word_values[selected]
+    
+    a_rad = np.deg2rad(a)
+    b_rad = np.deg2rad(b)
+    new_x = np.maximum(x + np.sin(a_rad) * La + np.cos(a_rad) * np.sin(b_rad) * Lb, 0)
+    new_y = np.maximum(y - La + np.cos(a_rad) * La - np.sin(a_rad) * np.sin(b_rad) * Lb, 0)
+    new_z = np.maximum(z + np.cos(b_rad) * Lb - Lb, 0)
+    
+    # Second pass: substitute the recalculated values, A and B words are kept as they are
+    values = parts[2::3]
+    for axis, new_column in ((b"X", new_x), (b"Y", new_y), (b"Z", new_z)):
+        selected = np.flatnonzero(is_command_word & (word_axes == axis))
+        for i, value in zip(selected.tolist(), new_column[word_lines[selected]].tolist()):
+            values[i] = b"%.5f" % value
+    parts[2::3] = values
+    return b"".join(parts)
 
 class SplineCanvas(QImageLabel if not MATPLOTLIB_QT_AVAILABLE else FigureCanvas):
     def __init__(self, parent=None, width=5, height=4, dpi=100):
@@ -51,18 +205,30 @@ class SplineCanvas(QImageLabel if not MATPLOTLIB_QT_AVAILABLE else FigureCanvas)
             self.setStyleSheet("border: 1px solid gray;")
             self.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self.setText("Spline preview will appear here")
+            
+            # Reuse one off-screen figure for every preview
+            self.fig = Figure(figsize=(5, 4), dpi=100)
+            self.axes = self.fig.add_subplot(111)
+            self.agg_canvas = FigureCanvasAgg(self.fig)
+        self._last_sig = None
 
     def plot_spline(self, spline_x, spline_z):
+        # Nothing to redraw if the control points are unchanged
+        sig = (tuple(spline_x), tuple(spline_z))
+        if self._last_sig == sig:
+            return
         if MATPLOTLIB_QT_AVAILABLE:
             self._plot_with_canvas(spline_x, spline_z)
         else:
             self._plot_with_image(spline_x, spline_z)
+        # Only remembered once the draw succeeded, a failed draw is retried on the next click
+        self._last_sig = sig
     
     def _plot_with_canvas(self, spline_x, spline_z):
         self.axes.clear()
         
-        # Create spline
-        spline = CubicSpline(spline_z, spline_x, bc_type=((1, 0), (1, 2.5)))
+        # Create spline (cached per control points)
+        spline = _make_spline(tuple(spline_x), tuple(spline_z))
         
         # Plot data points and spline
         xs = np.arange(spline_z[0], spline_z[-1], 1)
@@ -81,11 +247,12 @@ class SplineCanvas(QImageLabel if not MATPLOTLIB_QT_AVAILABLE else FigureCanvas)
         self.draw()
     
     def _plot_with_image(self, spline_x, spline_z):
-        # Create plot using matplotlib with Agg backend and display as image
-        fig, ax = plt.subplots(figsize=(5, 4), dpi=100)
+        # Render with the cached Agg figure and display the RGBA buffer as image
+        ax = self.axes
+        ax.clear()
         
-        # Create spline
-        spline = CubicSpline(spline_z, spline_x, bc_type=((1, 0), (1, 2.5)))
+        # Create spline (cached per control points)
+        spline = _make_spline(tuple(spline_x), tuple(spline_z))
         
         # Plot data points and spline
         xs = np.arange(spline_z[0], spline_z[-1], 1)
@@ -101,35 +268,46 @@ class SplineCanvas(QImageLabel if not MATPLOTLIB_QT_AVAILABLE else FigureCanvas)
         ax.grid(True, alpha=0.3)
         ax.set_aspect('equal', adjustable='box')
         
-        # Save to temporary file and load as pixmap
-        import tempfile
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-            fig.savefig(tmp.name, bbox_inches='tight', dpi=100)
-            tmp_path = tmp.name
-        
-        plt.close(fig)
+        self.fig.tight_layout()
+        self.agg_canvas.draw()
+        buf = np.asarray(self.agg_canvas.buffer_rgba())
+        height, width = buf.shape[:2]
         
-        # Load and display the image
-        pixmap = QPixmap(tmp_path)
+        # QPixmap.fromImage copies the pixels, so the buffer only has to outlive this call
+        image = QImage(buf.data, width, height, buf.strides[0], QImage.Format.Format_RGBA8888)
+        pixmap = QPixmap.fromImage(image)
         self.setPixmap(pixmap.scaled(400, 300, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
-        
-        # Clean up temp file
-        try:
-            os.unlink(tmp_path)
-        except:
-            pass
 
-class ProcessWorker(QThread):
+class WorkerSignals(QObject):
     log_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(str)
     error_signal = pyqtSignal(str)
 
+class ProcessWorker(QRunnable):
+    """Processing task run on the shared QThreadPool; talks to the GUI through self.signals"""
+
     def __init__(self, process_type, input_file, output_file, params=None):
         super().__init__()
+        self.signals = WorkerSignals()
         self.process_type = process_type
         self.input_file = input_file
         self.output_file = output_file
         self.params = params
+        self._log_lines = []
+        self._last_log_time = 0.0
+
+    def log(self, message):
+        """Queue a log line, sending queued lines to the GUI every LOG_EMIT_LINES lines or LOG_EMIT_INTERVAL"""
+        self._log_lines.append(message)
+        if (len(self._log_lines) >= LOG_EMIT_LINES
+                or time.monotonic() - self._last_log_time >= LOG_EMIT_INTERVAL):
+            self.flush_log()
+
+    def flush_log(self):
+        if self._log_lines:
+            self.signals.log_signal.emit("\n".join(self._log_lines))
+            self._log_lines.clear()
+        self._last_log_time = time.monotonic()
 
     def run(self):
         try:
@@ -139,253 +317,233 @@ class ProcessWorker(QThread):
                 self.run_ik_translation()
             elif self.process_type == "klipper":
                 self.run_klipper_conversion()
+            elif self.process_type == "pipeline":
+                self.run_pipeline()
         except Exception as e:
-            self.error_signal.emit(str(e))
+            self.flush_log()
+            self.signals.error_signal.emit(str(e))
 
     def run_bending(self):
+        with open(self.output_file, "w+") as output_file:
+            output_file.writelines(self.bend_chunks(self.input_file))
+        
+        self.log("G-code bending finished!")
+        self.flush_log()
+        self.signals.finished_signal.emit("bending")
+
+    def bend_chunks(self, input_file):
+        """Bend a G-code file and return a generator of the output text (see bent_chunks)"""
         # Extract bending logic from bend_gcode_Baxis_exhaust3.py
-        self.log_signal.emit("Starting G-code bending process...")
+        self.log("Starting G-code bending process...")
         
         spline_x = self.params['spline_x']
         spline_z = self.params['spline_z']
         layer_height = self.params['layer_height']
         warning_angle = self.params['warning_angle']
-        
-        # Create spline
-        spline = CubicSpline(spline_z, spline_x, bc_type=((1, 0), (1, 2.5)))
-        
-        # Create spline lookup table
         discretization_length = self.params['discretization_length']
-        spline_lookup_table = [0.0]
-        height_steps = np.arange(discretization_length, spline_z[-1], discretization_length)
-        for i in range(len(height_steps)):
-            height = height_steps[i]
-            spline_lookup_table.append(spline_lookup_table[i] + 
-                np.sqrt((spline(height) - spline(height - discretization_length))**2 + discretization_length**2))
-        
-        def on_spline_length(z_height):
-            for i in range(len(spline_lookup_table)):
-                height = spline_lookup_table[i]
-                if height >= z_height:
-                    return i * discretization_length
-            self.log_signal.emit(f"Warning! Spline not defined high enough for Z={z_height}")
-            return z_height
-        
-        def get_normal_point(current_point, derivative, distance):
-            angle = np.arctan(derivative) + math.pi / 2
-            return Point2D(current_point.x + distance * np.cos(angle), 
-                          current_point.y + distance * np.sin(angle))
-        
-        def parse_gcode(current_line):
-            pattern = re.compile(r'(?i)^[gG][0-3](?:\s+x(?P<x>-?[0-9.]{1,15})|\s+y(?P<y>-?[0-9.]{1,15})|\s+z(?P<z>-?[0-9.]{1,15})|\s+e(?P<e>-?[0-9.]{1,15})|\s+f(?P<f>-?[0-9.]{1,15}))*')
-            line_entries = pattern.match(current_line)
-            if line_entries:
-                return GCodeLine(line_entries.group('x'), line_entries.group('y'), 
-                               line_entries.group('z'), line_entries.group('e'), line_entries.group('f'))
-            return None
-        
-        def write_line(output_file, g, x, y, z, a, f=None, e=None):
-            output_string = f"G{int(g)} X{round(x,5)} Y{round(y,5)} Z{round(z,3)} A0 B{round(a,3)}"
-            if e is not None:
-                output_string += f" E{round(float(e),5)}"
-            if f is not None:
-                output_string += f" F{int(float(f))}"
-            output_file.write(output_string + "\n")
-        
-        # Process the G-code file
-        last_position = Point2D(0, 0)
-        current_z = 0.0
-        last_z = 0.0
-        relative_mode = False
-        
-        with open(self.input_file, "r") as gcode_file, open(self.output_file, "w+") as output_file:
-            for current_line in gcode_file:
-                if current_line[0] == ";":
-                    output_file.write(current_line)
-                    continue
-                
-                if current_line.find("G91 ") != -1:
-                    relative_mode = True
-                    output_file.write(current_line)
-                    continue
-                
-                if current_line.find("G90 ") != -1:
-                    relative_mode = False
-                    output_file.write(current_line)
-                    continue
-                
-                if relative_mode:
-                    output_file.write(current_line)
-                    continue
-                
-                current_line_commands = parse_gcode(current_line)
-                if current_line_commands is not None:
-                    if current_line_commands.z is not None:
-                        current_z = float(current_line_commands.z)
-                    
-                    if current_line_commands.x is None or current_line_commands.y is None:
-                        if current_line_commands.z is not None:
-                            output_file.write(f"G91\nG1 Z{current_z-last_z}")
-                            if current_line_commands.f is not None:
-                                output_file.write(f" F{current_line_commands.f}")
-                            output_file.write("\nG90\nM83\n")
-                            last_z = current_z
-                            continue
-                        output_file.write(current_line)
-                        continue
-                    
-                    current_position = Point2D(float(current_line_commands.x), float(current_line_commands.y))
-                    midpoint_x = last_position.x + (current_position.x - last_position.x) / 2
-                    
-                    dist_to_spline = midpoint_x - spline_x[0]
-                    corrected_z_height = on_spline_length(current_z)
-                    
-                    angle_spline_this_layer = np.arctan(spline(corrected_z_height, 1))
-                    angle_last_layer = np.arctan(spline(corrected_z_height - layer_height, 1))
-                    
-                    height_difference = np.sin(angle_spline_this_layer - angle_last_layer) * dist_to_spline * -1
-                    
-                    transformed_gcode = get_normal_point(
-                        Point2D(corrected_z_height, spline(corrected_z_height)), 
-                        spline(corrected_z_height, 1), 
-                        current_position.x - spline_x[0]
-                    )
-                    
-                    if float(transformed_gcode.x) <= 0.0:
-                        self.log_signal.emit("Warning! Movement below build platform. Check your spline!")
-                    
-                    if transformed_gcode.x < 0 or np.abs(transformed_gcode.x - current_z) > 50:
-                        self.log_signal.emit(f"Warning! Possibly unplausible move detected on height {current_z} mm!")
-                        output_file.write(current_line)
-                        continue
-                    
-                    if (layer_height + height_difference) < 0:
-                        self.log_signal.emit(f"ERROR! Self intersection on height {current_z} mm! Check your spline!")
-                    
-                    if angle_spline_this_layer > (warning_angle * np.pi / 180.):
-                        self.log_signal.emit(f"Warning! Spline angle is {angle_spline_this_layer * 180. / np.pi:.2f}° at height {current_z} mm!")
-                    
-                    if current_line_commands.e is not None:
-                        extrusion_amount = float(current_line_commands.e) * ((layer_height + height_difference) / layer_height)
-                    else:
-                        extrusion_amount = None
-                    
-                    b_axis = angle_spline_this_layer * 57.2958  # radians to degrees
-                    write_line(output_file, 1, transformed_gcode.y, current_position.y, 
-                             transformed_gcode.x, b_axis, None, extrusion_amount)
-                    
-                    last_position = current_position
-                    last_z = current_z
-                else:
-                    output_file.write(current_line)
         
-        self.log_signal.emit("G-code bending finished!")
-        self.finished_signal.emit("bending")
+        # Read and pre-parse the G-code while the spline and its lookup table are built
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            parse_future = executor.submit(read_gcode_file, input_file)
+            
+            # Create spline (cached per control points)
+            spline = _make_spline(tuple(spline_x), tuple(spline_z))
+            
+            # Create spline lookup table
+            c, breaks = spline_coefficients(spline)
+            spline_lookup_table = build_lut(c, breaks, float(spline_z[-1]), discretization_length)
+            
+            lines, (kinds, xs, ys, zs, es, fs) = parse_future.result()
+        
+        # A second bending or pipeline run waits here instead of entering the kernel concurrently
+        with KERNEL_LOCK:
+            actions, flags, out_x, out_y, out_z, out_b, out_e, current_zs = bend_kernel(
+                kinds, xs, ys, zs, es, c, breaks, layer_height, spline_x[0],
+                discretization_length, spline_lookup_table, warning_angle * np.pi / 180.)
+        
+        for i in np.flatnonzero(flags):
+            flag = flags[i]
+            current_z = current_zs[i]
+            if flag & WARN_SPLINE_TOO_SHORT:
+                self.log(f"Warning! Spline not defined high enough for Z={current_z}")
+            if flag & WARN_BELOW_PLATFORM:
+                self.log("Warning! Movement below build platform. Check your spline!")
+            if flag & WARN_UNPLAUSIBLE:
+                self.log(f"Warning! Possibly unplausible move detected on height {current_z} mm!")
+            if flag & WARN_SELF_INTERSECTION:
+                self.log(f"ERROR! Self intersection on height {current_z} mm! Check your spline!")
+            if flag & WARN_ANGLE:
+                self.log(f"Warning! Spline angle is {out_b[i]:.2f}° at height {current_z} mm!")
+        
+        return bent_chunks(lines, actions, fs, out_x, out_y, out_z, out_b, out_e)
 
     def run_ik_translation(self):
-        self.log_signal.emit("Starting IK translation process...")
-        
-        La = 28.4
-        Lb = 47.7
-        
-        def func_x(x_val, y_val, z_val, a_val, b_val):
-            return max(x_val + math.sin(math.radians(a_val)) * La + 
-                      math.cos(math.radians(a_val)) * math.sin(math.radians(b_val)) * Lb, 0)
-
-        def func_y(x_val, y_val, z_val, a_val, b_val):
-            return max(y_val - La + math.cos(math.radians(a_val)) * La - 
-                      math.sin(math.radians(a_val)) * math.sin(math.radians(b_val)) * Lb, 0)
-
-        def func_z(x_val, y_val, z_val, a_val, b_val):
-            return max(z_val + math.cos(math.radians(b_val)) * Lb - Lb, 0)
-
-        def recalculate(line):
-            if not line.startswith("G") and not line.startswith("M"):
-                return line
-
-            parts = line.split()
-            x_val = y_val = z_val = a_val = b_val = 0
-
-            x_indices = []
-            y_indices = []
-            z_indices = []
-
-            for i in range(1, len(parts)):
-                if parts[i].startswith("X"):
-                    x_val = float(parts[i][1:])
-                    x_indices.append(i)
-                elif parts[i].startswith("Y"):
-                    y_val = float(parts[i][1:])
-                    y_indices.append(i)
-                elif parts[i].startswith("Z"):
-                    z_val = float(parts[i][1:])
-                    z_indices.append(i)
-                elif parts[i].startswith("A"):
-                    a_val = float(parts[i][1:])
-                elif parts[i].startswith("B"):
-                    b_val = float(parts[i][1:])
-
-            for i in x_indices:
-                parts[i] = "X" + str(func_x(x_val, y_val, z_val, a_val, b_val))
-
-            for i in y_indices:
-                parts[i] = "Y" + str(func_y(x_val, y_val, z_val, a_val, b_val))
-            
-            for i in z_indices:
-                parts[i] = "Z" + str(func_z(x_val, y_val, z_val, a_val, b_val))
+        # Each block is translated and written before the next one is read
+        with open_mapped(self.input_file) as data, open(self.output_file, "wb") as f:
+            f.writelines(self.translate_ik(line_blocks(data)))
 
-            return " ".join(parts)
+        self.log("IK translation finished!")
+        self.flush_log()
+        self.signals.finished_signal.emit("ik")
 
-        with open(self.input_file) as f:
-            lines = f.readlines()
+    def translate_ik(self, blocks):
+        """Translate an iterable of line-aligned G-code byte blocks, yielding the translated blocks"""
+        self.log("Starting IK translation process...")
+        return map(translate_ik_block, blocks)
 
-        with open(self.output_file, "w") as f:
-            for line in lines:
-                new_line = recalculate(line.strip())
-                f.write(new_line + "\n")
+    def run_klipper_conversion(self):
+        with open(self.input_file, 'rb') as infile, open(self.output_file, 'wb', buffering=OUTPUT_BUFFER_BYTES) as outfile:
+            outfile.writelines(self.convert_klipper(infile))
+
+        self.log("Klipper conversion finished!")
+        self.flush_log()
+        self.signals.finished_signal.emit("klipper")
+
+    def convert_klipper(self, raw_lines):
+        """Convert an iterable of G-code byte lines, returning a generator of Klipper byte lines"""
+        self.log("Starting Klipper conversion process...")
+        return convert_lines(raw_lines)
+
+    def run_pipeline(self):
+        # Bending -> IK -> Klipper chained chunk by chunk: every bent chunk is translated,
+        # converted and written before the next one is made, only the Klipper file is written
+        bent_blocks = (chunk.encode() for chunk in self.bend_chunks(self.input_file))
+        ik_lines = chain.from_iterable(map(io.BytesIO, self.translate_ik(bent_blocks)))
+        with open(self.output_file, 'wb', buffering=OUTPUT_BUFFER_BYTES) as outfile:
+            outfile.writelines(self.convert_klipper(ik_lines))
+
+        self.log("Pipeline finished!")
+        self.flush_log()
+        self.signals.finished_signal.emit("pipeline")
+
+class PrinterTaskSignals(QObject):
+    finished_signal = pyqtSignal(object)
+    error_signal = pyqtSignal(str)
 
-        self.log_signal.emit("IK translation finished!")
-        self.finished_signal.emit("ik")
+class PrinterTask(QRunnable):
+    """Blocking printer controller call run on the shared QThreadPool"""
 
-    def run_klipper_conversion(self):
-        self.log_signal.emit("Starting Klipper conversion process...")
+    def __init__(self, function, *args):
+        super().__init__()
+        self.signals = PrinterTaskSignals()
+        self.function = function
+        self.args = args
+
+    def run(self):
+        try:
+            result = self.function(*self.args)
+        except Exception as e:
+            self.signals.error_signal.emit(str(e))
+        else:
+            self.signals.finished_signal.emit(result)
+
+class PrinterStatusSubscriber(QObject):
+    """Moonraker websocket subscription: the printer pushes status changes instead of being polled"""
+    status_signal = pyqtSignal(dict)
+
+    SUBSCRIBE_ID = 1
+
+    def __init__(self, host, port=7125, parent=None):
+        super().__init__(parent)
+        self.url = QUrl(f"ws://{host}:{port}/websocket")
+        self.status = {}
+        self.socket = QWebSocket()
+        self.socket.connected.connect(self._subscribe)
+        self.socket.textMessageReceived.connect(self._on_message)
+
+    def start(self):
+        self.socket.open(self.url)
+
+    def stop(self):
+        self.socket.close()
+        self.socket.deleteLater()
+
+    def _subscribe(self):
+        self.socket.sendTextMessage(json.dumps({
+            "jsonrpc": "2.0",
+            "method": "printer.objects.subscribe",
+            "params": {"objects": {"print_stats": None, "toolhead": None, "extruder": None}},
+            "id": self.SUBSCRIBE_ID
+        }))
+
+    def _on_message(self, message):
+        data = json.loads(message)
+        if data.get("id") == self.SUBSCRIBE_ID:
+            updates = data.get("result", {}).get("status", {})
+        elif data.get("method") == "notify_status_update":
+            updates = data["params"][0]
+        else:
+            return
+        # Updates only carry the changed fields, merge them into the full status
+        for name, fields in updates.items():
+            self.status.setdefault(name, {}).update(fields)
+        self.status_signal.emit(self.status)
+
+class GCodeProcessorGUI(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.input_file = ""
+        self._bent_path = self._ik_path = self._klipper_path = self._klipper_basename = ""
+        self._pool = QThreadPool.globalInstance()
+        self._clipboard = QApplication.clipboard()
+        
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(PROGRESS_DELAY_MS)
+        self._progress_timer.timeout.connect(lambda: self.progress_bar.setVisible(True))
+        
+        # One message box per kind, reused for every notification
+        self._info_box = QMessageBox(self)
+        self._info_box.setIcon(QMessageBox.Icon.Information)
+        self._warn_box = QMessageBox(self)
+        self._warn_box.setIcon(QMessageBox.Icon.Warning)
+        self._error_box = QMessageBox(self)
+        self._error_box.setIcon(QMessageBox.Icon.Critical)
+        
+        # Log lines are collected and appended to the log view in one go every LOG_EMIT_INTERVAL
+        self._log_buf = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(int(LOG_EMIT_INTERVAL * 1000))
+        self._log_timer.timeout.connect(self._flush_log)
         
-        with open(self.input_file, 'r', encoding='utf-8', errors='ignore') as infile:
-            lines = infile.readlines()
+        self.init_ui()
 
-        converted_lines = []
-        last_b_value = None
+    def _show_message(self, box, title, text):
+        # A worker can finish while the shared box is still open, use a separate one then
+        if box.isVisible():
+            box = QMessageBox(box.icon(), title, text, parent=self)
+        box.setWindowTitle(title)
+        box.setText(text)
+        box.exec()
 
-        for line in lines:
-            original_line = line.strip()
+    def show_info(self, title, text):
+        self._show_message(self._info_box, title, text)
 
-            if original_line.startswith("G1"):
-                # Extract B-axis value if it exists
-                b_match = re.search(r"\bB(-?\d+\.?\d*)", original_line)
-                if b_match:
-                    current_b = float(b_match.group(1))
-                    if last_b_value is None or current_b != last_b_value:
-                        converted_lines.append(f"MANUAL_STEPPER STEPPER=b_stepper MOVE={current_b}")
-                        last_b_value = current_b
-                    # Remove B from the G1 line
-                    original_line = re.sub(r"\s*B-?\d+\.?\d*", "", original_line)
+    def show_warning(self, title, text):
+        self._show_message(self._warn_box, title, text)
 
-                # Remove A (e.g., A0)
-                original_line = re.sub(r"\s*A-?\d+\.?\d*", "", original_line)
+    def show_error(self, title, text):
+        self._show_message(self._error_box, title, text)
 
-            converted_lines.append(original_line)
+    def show_progress(self):
+        """Show the indeterminate progress bar if the task is still running after PROGRESS_DELAY_MS"""
+        self.progress_bar.setRange(0, 0)
+        self._progress_timer.start()
 
-        with open(self.output_file, 'w', encoding='utf-8') as outfile:
-            outfile.write("\n".join(converted_lines))
+    def hide_progress(self):
+        self._progress_timer.stop()
+        self.progress_bar.setVisible(False)
 
-        self.log_signal.emit("Klipper conversion finished!")
-        self.finished_signal.emit("klipper")
+    def log(self, message):
+        self._log_buf.append(message)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
 
-class GCodeProcessorGUI(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.input_file = ""
-        self.init_ui()
+    def _flush_log(self):
+        if self._log_buf:
+            self.log_output.append("\n".join(self._log_buf))
+            self._log_buf.clear()
 
     def init_ui(self):
         self.setWindowTitle("3D Bending & IK G-code Utility")
@@ -428,6 +586,10 @@ class GCodeProcessorGUI(QMainWindow):
         self.connection_status.setStyleSheet("QLabel { color: gray; }")
         printer_layout.addWidget(self.connection_status, 1, 0, 1, 3)
         
+        self.printer_status_label = QLabel("")
+        self.printer_status_label.setStyleSheet("QLabel { color: gray; }")
+        printer_layout.addWidget(self.printer_status_label, 2, 0, 1, 3)
+        
         printer_group.setLayout(printer_layout)
         
         # Printer Setup Commands Group
@@ -543,9 +705,15 @@ class GCodeProcessorGUI(QMainWindow):
         self.klipper_button.clicked.connect(self.run_klipper_conversion)
         #self.klipper_button.setEnabled(False)
         
+        self.pipeline_button = QPushButton("▶ Run All (Pipeline)")
+        self.pipeline_button.clicked.connect(self.run_all_pipeline)
+        self.pipeline_button.setEnabled(False)
+        self.pipeline_button.setToolTip("Bending → IK → Klipper in one go, only the final Klipper file is written")
+        
         process_layout.addWidget(self.bend_button)
         process_layout.addWidget(self.ik_button)
         process_layout.addWidget(self.klipper_button)
+        process_layout.addWidget(self.pipeline_button)
         process_group.setLayout(process_layout)
 
         # Output Files Group
@@ -628,6 +796,8 @@ class GCodeProcessorGUI(QMainWindow):
         
         # Initialize printer controller
         self.printer_controller = None
+        self.printer_task = None
+        self.status_subscriber = None
         
         # Add keyboard shortcuts for full screen control
         self.fullscreen_shortcut = QShortcut(QKeySequence("F11"), self)
@@ -644,10 +814,11 @@ class GCodeProcessorGUI(QMainWindow):
             self, "Select G-code File", "", "G-code Files (*.gcode);;All Files (*)")
         
         if file_path:
-            self.input_file = file_path
+            self.set_input_file(file_path)
             self.file_label.setText(os.path.basename(file_path))
             self.bend_button.setEnabled(True)
-            self.log_output.append(f"Selected file: {file_path}")
+            self.pipeline_button.setEnabled(True)
+            self.log(f"Selected file: {file_path}")
 
     def preview_spline(self):
         try:
@@ -655,7 +826,7 @@ class GCodeProcessorGUI(QMainWindow):
             spline_z = [float(self.spline_z_start.text()), float(self.spline_z_end.text())]
             self.spline_canvas.plot_spline(spline_x, spline_z)
         except ValueError:
-            QMessageBox.warning(self, "Input Error", "Please enter valid numeric values for spline parameters.")
+            self.show_warning("Input Error", "Please enter valid numeric values for spline parameters.")
 
     def get_output_filename(self, prefix, input_file):
         directory = os.path.dirname(input_file)
@@ -663,13 +834,18 @@ class GCodeProcessorGUI(QMainWindow):
         name, ext = os.path.splitext(filename)
         return os.path.join(directory, f"{prefix}_{name}{ext}")
 
-    def run_bending(self):
-        if not self.input_file:
-            QMessageBox.warning(self, "No File", "Please select a G-code file first.")
-            return
+    def set_input_file(self, file_path):
+        """Select a new input file and derive its output file names once"""
+        self.input_file = file_path
+        self._bent_path = self.get_output_filename("BENT", file_path)
+        self._ik_path = self.get_output_filename("IK", file_path)
+        self._klipper_path = self.get_output_filename("KLIPPER", file_path)
+        self._klipper_basename = os.path.basename(self._klipper_path)
 
+    def get_bending_params(self):
+        """Read the bending parameters from the form, warning and returning None if one is invalid"""
         try:
-            params = {
+            return {
                 'spline_x': [float(self.spline_x_start.text()), float(self.spline_x_end.text())],
                 'spline_z': [float(self.spline_z_start.text()), float(self.spline_z_end.text())],
                 'layer_height': float(self.layer_height.text()),
@@ -677,205 +853,251 @@ class GCodeProcessorGUI(QMainWindow):
                 'discretization_length': float(self.discretization_length.text())
             }
         except ValueError:
-            QMessageBox.warning(self, "Input Error", "Please enter valid numeric values for all parameters.")
+            self.show_warning("Input Error", "Please enter valid numeric values for all parameters.")
+            return None
+
+    def run_bending(self):
+        if not self.input_file:
+            self.show_warning("No File", "Please select a G-code file first.")
+            return
+
+        params = self.get_bending_params()
+        if params is None:
             return
 
-        output_file = self.get_output_filename("BENT", self.input_file)
+        output_file = self._bent_path
         
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, 0)  # Indeterminate progress
+        self.show_progress()
         
-        self.worker = ProcessWorker("bending", self.input_file, output_file, params)
-        self.worker.log_signal.connect(self.log_output.append)
-        self.worker.finished_signal.connect(self.on_process_finished)
-        self.worker.error_signal.connect(self.on_process_error)
-        self.worker.start()
+        self.start_worker("bending", self.input_file, output_file, params)
 
     def run_ik_translation(self):
-        bent_file = self.get_output_filename("BENT", self.input_file)
+        bent_file = self._bent_path
         if not os.path.exists(bent_file):
-            QMessageBox.warning(self, "File Not Found", "Please run bending first.")
+            self.show_warning("File Not Found", "Please run bending first.")
             return
 
-        output_file = self.get_output_filename("IK", self.input_file)
+        output_file = self._ik_path
         
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, 0)
+        self.show_progress()
         
-        self.worker = ProcessWorker("ik", bent_file, output_file)
-        self.worker.log_signal.connect(self.log_output.append)
-        self.worker.finished_signal.connect(self.on_process_finished)
-        self.worker.error_signal.connect(self.on_process_error)
-        self.worker.start()
+        self.start_worker("ik", bent_file, output_file)
 
     def run_klipper_conversion(self):
-        ik_file = self.get_output_filename("IK", self.input_file)
+        ik_file = self._ik_path
         if not os.path.exists(ik_file):
-            QMessageBox.warning(self, "File Not Found", "Please run IK translation first.")
+            self.show_warning("File Not Found", "Please run IK translation first.")
             return
 
-        output_file = self.get_output_filename("KLIPPER", self.input_file)
+        output_file = self._klipper_path
         
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, 0)
+        self.show_progress()
+        
+        self.start_worker("klipper", ik_file, output_file)
+
+    def run_all_pipeline(self):
+        if not self.input_file:
+            self.show_warning("No File", "Please select a G-code file first.")
+            return
+
+        params = self.get_bending_params()
+        if params is None:
+            return
+
+        output_file = self._klipper_path
         
-        self.worker = ProcessWorker("klipper", ik_file, output_file)
-        self.worker.log_signal.connect(self.log_output.append)
-        self.worker.finished_signal.connect(self.on_process_finished)
-        self.worker.error_signal.connect(self.on_process_error)
-        self.worker.start()
+        self.show_progress()
+        
+        self.start_worker("pipeline", self.input_file, output_file, params)
+
+    def start_worker(self, process_type, input_file, output_file, params=None):
+        self.worker = ProcessWorker(process_type, input_file, output_file, params)
+        # Queued explicitly: the worker runs on a pool thread and must never call into the GUI directly
+        queued = Qt.ConnectionType.QueuedConnection
+        self.worker.signals.log_signal.connect(self.log, queued)
+        self.worker.signals.finished_signal.connect(self.on_process_finished, queued)
+        self.worker.signals.error_signal.connect(self.on_process_error, queued)
+        self._pool.start(self.worker)
 
     def on_process_finished(self, process_type):
-        self.progress_bar.setVisible(False)
+        self.hide_progress()
         
         if process_type == "bending":
-            bent_file = self.get_output_filename("BENT", self.input_file)
+            bent_file = self._bent_path
             self.bent_file_label.setText(os.path.basename(bent_file))
             self.bent_file_label.setToolTip(bent_file)
             self.ik_button.setEnabled(True)
             self.open_folder_button.setEnabled(True)
-            QMessageBox.information(self, "Success", f"Bending process completed successfully!\nOutput: {os.path.basename(bent_file)}")
+            self.show_info("Success", f"Bending process completed successfully!\nOutput: {os.path.basename(bent_file)}")
         elif process_type == "ik":
-            ik_file = self.get_output_filename("IK", self.input_file)
+            ik_file = self._ik_path
             self.ik_file_label.setText(os.path.basename(ik_file))
             self.ik_file_label.setToolTip(ik_file)
             self.klipper_button.setEnabled(True)
-            QMessageBox.information(self, "Success", f"IK translation completed successfully!\nOutput: {os.path.basename(ik_file)}")
-        elif process_type == "klipper":
-            klipper_file = self.get_output_filename("KLIPPER", self.input_file)
-            self.klipper_file_label.setText(os.path.basename(klipper_file))
+            self.show_info("Success", f"IK translation completed successfully!\nOutput: {os.path.basename(ik_file)}")
+        elif process_type in ("klipper", "pipeline"):
+            klipper_file = self._klipper_path
+            self.klipper_file_label.setText(self._klipper_basename)
             self.klipper_file_label.setToolTip(klipper_file)
             self.copy_path_button.setEnabled(True)
+            self.open_folder_button.setEnabled(True)
             
-            # Enable printer buttons if connected
-            if self.printer_controller:
+            # Enable printer buttons if connected and no upload is running
+            if self.printer_controller and not self.printer_task:
                 self.upload_only_button.setEnabled(True)
                 self.send_to_printer_button.setEnabled(True)
             
-            QMessageBox.information(self, "Success", f"Klipper conversion completed successfully!\nOutput: {os.path.basename(klipper_file)}")
+            self.show_info("Success", f"Klipper conversion completed successfully!\nOutput: {self._klipper_basename}")
 
     def on_process_error(self, error_message):
-        self.progress_bar.setVisible(False)
-        QMessageBox.critical(self, "Process Error", f"An error occurred: {error_message}")
-        self.log_output.append(f"ERROR: {error_message}")
+        self.hide_progress()
+        self.show_error("Process Error", f"An error occurred: {error_message}")
+        self.log(f"ERROR: {error_message}")
 
     def open_output_folder(self):
         if self.input_file:
             folder_path = os.path.dirname(self.input_file)
-            try:
-                subprocess.Popen(f'explorer "{folder_path}"', shell=True)
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Could not open folder: {e}")
+            if not QDesktopServices.openUrl(QUrl.fromLocalFile(folder_path)):
+                self.show_warning("Error", f"Could not open folder: {folder_path}")
 
     def copy_final_path(self):
-        klipper_file = self.get_output_filename("KLIPPER", self.input_file)
+        klipper_file = self._klipper_path
         if os.path.exists(klipper_file):
             try:
                 # Copy to clipboard using Qt
-                from PyQt6.QtWidgets import QApplication
-                clipboard = QApplication.clipboard()
-                clipboard.setText(klipper_file)
-                QMessageBox.information(self, "Copied", f"Final output path copied to clipboard:\n{os.path.basename(klipper_file)}")
+                self._clipboard.setText(klipper_file)
+                self.show_info("Copied", f"Final output path copied to clipboard:\n{self._klipper_basename}")
             except Exception as e:
-                QMessageBox.warning(self, "Error", f"Could not copy to clipboard: {e}")
+                self.show_warning("Error", f"Could not copy to clipboard: {e}")
 
     def send_to_printer(self):
         if not KLIPPER_AVAILABLE:
-            QMessageBox.warning(self, "Feature Unavailable", "Klipper remote control is not available. Please check installation.")
+            self.show_warning("Feature Unavailable", "Klipper remote control is not available. Please check installation.")
             return
             
-        klipper_file = self.get_output_filename("KLIPPER", self.input_file)
+        klipper_file = self._klipper_path
         if not os.path.exists(klipper_file):
-            QMessageBox.warning(self, "File Not Found", "Please complete Klipper conversion first.")
+            self.show_warning("File Not Found", "Please complete Klipper conversion first.")
             return
             
         if not self.printer_controller:
-            QMessageBox.warning(self, "Not Connected", "Please test printer connection first.")
+            self.show_warning("Not Connected", "Please test printer connection first.")
             return
             
         # Confirm before starting print
         reply = QMessageBox.question(self, "Confirm Print", 
-                                   f"Upload and start printing:\n{os.path.basename(klipper_file)}?",
+                                   f"Upload and start printing:\n{self._klipper_basename}?",
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setRange(0, 0)
-            self.log_output.append("Uploading file and starting print...")
+            self.show_progress()
+            self.log("Uploading file and starting print...")
             
-            try:
-                result = self.printer_controller.upload_and_print(klipper_file)
-                self.progress_bar.setVisible(False)
-                
-                if result["success"]:
-                    QMessageBox.information(self, "Print Started", 
-                                          f"Successfully uploaded and started printing:\n{os.path.basename(klipper_file)}")
-                    self.log_output.append("✅ Print started successfully!")
-                else:
-                    QMessageBox.critical(self, "Print Failed", f"Failed to start print:\n{result['error']}")
-                    self.log_output.append(f"❌ Print failed: {result['error']}")
-            except Exception as e:
-                self.progress_bar.setVisible(False)
-                QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
-                self.log_output.append(f"❌ Error: {str(e)}")
+            # Upload in the background so the GUI stays responsive
+            klipper_name = self._klipper_basename
+            self.start_printer_task(lambda result: self.on_print_started(result, klipper_name),
+                                    self.printer_controller.upload_and_print, klipper_file)
+
+    def on_print_started(self, result, klipper_name):
+        self.finish_printer_task()
+        if result["success"]:
+            self.show_info("Print Started", 
+                         f"Successfully uploaded and started printing:\n{klipper_name}")
+            self.log("✅ Print started successfully!")
+        else:
+            self.show_error("Print Failed", f"Failed to start print:\n{result['error']}")
+            self.log(f"❌ Print failed: {result['error']}")
 
     def upload_only(self):
         if not KLIPPER_AVAILABLE:
-            QMessageBox.warning(self, "Feature Unavailable", "Klipper remote control is not available. Please check installation.")
+            self.show_warning("Feature Unavailable", "Klipper remote control is not available. Please check installation.")
             return
             
-        klipper_file = self.get_output_filename("KLIPPER", self.input_file)
+        klipper_file = self._klipper_path
         if not os.path.exists(klipper_file):
-            QMessageBox.warning(self, "File Not Found", "Please complete Klipper conversion first.")
+            self.show_warning("File Not Found", "Please complete Klipper conversion first.")
             return
             
         if not self.printer_controller:
-            QMessageBox.warning(self, "Not Connected", "Please test printer connection first.")
+            self.show_warning("Not Connected", "Please test printer connection first.")
             return
             
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, 0)
-        self.log_output.append("Uploading file...")
-        
-        try:
-            result = self.printer_controller.upload_file(klipper_file)
-            self.progress_bar.setVisible(False)
-            
-            if result["success"]:
-                QMessageBox.information(self, "Upload Complete", 
-                                      f"Successfully uploaded:\n{os.path.basename(klipper_file)}")
-                self.log_output.append("✅ File uploaded successfully!")
-            else:
-                QMessageBox.critical(self, "Upload Failed", f"Failed to upload file:\n{result['error']}")
-                self.log_output.append(f"❌ Upload failed: {result['error']}")
-        except Exception as e:
-            self.progress_bar.setVisible(False)
-            QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
-            self.log_output.append(f"❌ Error: {str(e)}")
+        self.show_progress()
+        self.log("Uploading file...")
+        
+        klipper_name = self._klipper_basename
+        self.start_printer_task(lambda result: self.on_upload_finished(result, klipper_name),
+                                self.printer_controller.upload_file, klipper_file)
+
+    def on_upload_finished(self, result, klipper_name):
+        self.finish_printer_task()
+        if result["success"]:
+            self.show_info("Upload Complete", 
+                         f"Successfully uploaded:\n{klipper_name}")
+            self.log("✅ File uploaded successfully!")
+        else:
+            self.show_error("Upload Failed", f"Failed to upload file:\n{result['error']}")
+            self.log(f"❌ Upload failed: {result['error']}")
+
+    def start_printer_task(self, on_finished, function, *args):
+        """Run a printer controller call on the thread pool, blocking further uploads and setups until it is done"""
+        self.upload_only_button.setEnabled(False)
+        self.send_to_printer_button.setEnabled(False)
+        self.mass_production_button.setEnabled(False)
+        self.five_axis_button.setEnabled(False)
+        # The task uses the controller's session, so it must not be replaced meanwhile
+        self.test_connection_button.setEnabled(False)
+        self.printer_task = PrinterTask(function, *args)
+        self.printer_task.signals.finished_signal.connect(on_finished)
+        self.printer_task.signals.error_signal.connect(self.on_printer_task_error)
+        self._pool.start(self.printer_task)
+
+    def finish_printer_task(self):
+        self.printer_task = None
+        self.hide_progress()
+        # Setup sequences also run as printer tasks, uploads need a converted file
+        uploadable = os.path.exists(self._klipper_path)
+        self.upload_only_button.setEnabled(uploadable)
+        self.send_to_printer_button.setEnabled(uploadable)
+        self.mass_production_button.setEnabled(True)
+        self.five_axis_button.setEnabled(True)
+        self.test_connection_button.setEnabled(True)
+
+    def on_printer_task_error(self, error_message):
+        self.finish_printer_task()
+        self.show_error("Error", f"An error occurred: {error_message}")
+        self.log(f"❌ Error: {error_message}")
 
     def test_printer_connection(self):
         if not KLIPPER_AVAILABLE:
-            QMessageBox.warning(self, "Feature Unavailable", 
-                              "Klipper remote control is not available.\nPlease install the 'requests' library.")
+            self.show_warning("Feature Unavailable", 
+                            "Klipper remote control is not available.\nPlease install the 'requests' library.")
             return
             
         ip_address = self.printer_ip.text().strip()
         if not ip_address:
-            QMessageBox.warning(self, "Invalid IP", "Please enter a valid IP address.")
+            self.show_warning("Invalid IP", "Please enter a valid IP address.")
             return
             
-        self.log_output.append(f"Testing connection to {ip_address}...")
+        if self.printer_task:
+            self.show_warning("Printer Busy", "Please wait for the current printer task to finish.")
+            return
+            
+        self.log(f"Testing connection to {ip_address}...")
         self.test_connection_button.setEnabled(False)
         self.connection_status.setText("🟡 Testing...")
         self.connection_status.setStyleSheet("QLabel { color: orange; }")
         
         try:
+            self.stop_status_updates()
+            if self.printer_controller:
+                self.printer_controller.close()
             self.printer_controller = KlipperRemoteController(ip_address)
             
             if self.printer_controller.test_connection():
                 self.connection_status.setText("🟢 Connected")
                 self.connection_status.setStyleSheet("QLabel { color: green; }")
-                self.log_output.append("✅ Successfully connected to printer!")
+                self.log("✅ Successfully connected to printer!")
                 
                 # Enable all printer control buttons
                 self.mass_production_button.setEnabled(True)
@@ -883,17 +1105,24 @@ class GCodeProcessorGUI(QMainWindow):
                 self.home_all_button.setEnabled(True)
                 self.emergency_stop_button.setEnabled(True)
                 
-                # Get and display printer status
-                status_result = self.printer_controller.get_printer_status()
-                if status_result["success"]:
-                    self.log_output.append("📊 Printer status retrieved successfully")
+                # Subscribe to status updates, or get the printer status once without websockets
+                if WEBSOCKETS_AVAILABLE:
+                    self.status_subscriber = PrinterStatusSubscriber(self.printer_controller.host,
+                                                                     self.printer_controller.port, self)
+                    self.status_subscriber.status_signal.connect(self.on_printer_status)
+                    self.status_subscriber.start()
+                else:
+                    status_result = self.printer_controller.get_printer_status()
+                    if status_result["success"]:
+                        self.log("📊 Printer status retrieved successfully")
                 
-                QMessageBox.information(self, "Connection Successful", 
-                                      f"Successfully connected to printer at {ip_address}")
+                self.show_info("Connection Successful", 
+                             f"Successfully connected to printer at {ip_address}")
             else:
                 self.connection_status.setText("🔴 Connection Failed")
                 self.connection_status.setStyleSheet("QLabel { color: red; }")
-                self.log_output.append("❌ Failed to connect to printer")
+                self.log("❌ Failed to connect to printer")
+                self.printer_controller.close()
                 self.printer_controller = None
                 
                 # Disable printer control buttons
@@ -902,17 +1131,19 @@ class GCodeProcessorGUI(QMainWindow):
                 self.home_all_button.setEnabled(False)
                 self.emergency_stop_button.setEnabled(False)
                 
-                QMessageBox.warning(self, "Connection Failed", 
-                                  f"Could not connect to printer at {ip_address}\n"
-                                  "Please check:\n"
-                                  "• IP address is correct\n"
-                                  "• Printer is powered on\n"
-                                  "• Moonraker service is running\n"
-                                  "• Network connection is working")
+                self.show_warning("Connection Failed", 
+                                f"Could not connect to printer at {ip_address}\n"
+                                "Please check:\n"
+                                "• IP address is correct\n"
+                                "• Printer is powered on\n"
+                                "• Moonraker service is running\n"
+                                "• Network connection is working")
         except Exception as e:
             self.connection_status.setText("🔴 Error")
             self.connection_status.setStyleSheet("QLabel { color: red; }")
-            self.log_output.append(f"❌ Connection error: {str(e)}")
+            self.log(f"❌ Connection error: {str(e)}")
+            if self.printer_controller:
+                self.printer_controller.close()
             self.printer_controller = None
             
             # Disable printer control buttons
@@ -921,32 +1152,55 @@ class GCodeProcessorGUI(QMainWindow):
             self.home_all_button.setEnabled(False)
             self.emergency_stop_button.setEnabled(False)
             
-            QMessageBox.critical(self, "Connection Error", f"An error occurred: {str(e)}")
+            self.show_error("Connection Error", f"An error occurred: {str(e)}")
         finally:
             self.test_connection_button.setEnabled(True)
 
+    def stop_status_updates(self):
+        if self.status_subscriber:
+            self.status_subscriber.stop()
+            self.status_subscriber.deleteLater()
+            self.status_subscriber = None
+        self.printer_status_label.setText("")
+
+    def on_printer_status(self, status):
+        text = f"State: {status.get('print_stats', {}).get('state', 'unknown')}"
+        temperature = status.get("extruder", {}).get("temperature")
+        if temperature is not None:
+            text += f" | Nozzle: {temperature:.1f}°C"
+        position = status.get("toolhead", {}).get("position")
+        if position:
+            text += f" | Z: {position[2]:.2f}"
+        self.printer_status_label.setText(text)
+
+    def closeEvent(self, event):
+        self.stop_status_updates()
+        if self.printer_controller:
+            self.printer_controller.close()
+        super().closeEvent(event)
+
     def toggle_fullscreen(self):
         """Toggle between fullscreen and maximized window"""
         if self.is_fullscreen:
             self.showMaximized()
             self.is_fullscreen = False
-            self.log_output.append("📺 Switched to maximized window mode (F11 to toggle)")
+            self.log("📺 Switched to maximized window mode (F11 to toggle)")
         else:
             self.showFullScreen()
             self.is_fullscreen = True
-            self.log_output.append("📺 Switched to full screen mode (ESC or F11 to exit)")
+            self.log("📺 Switched to full screen mode (ESC or F11 to exit)")
     
     def exit_fullscreen(self):
         """Exit fullscreen mode"""
         if self.is_fullscreen:
             self.showMaximized()
             self.is_fullscreen = False
-            self.log_output.append("📺 Exited full screen mode")
+            self.log("📺 Exited full screen mode")
 
     def setup_mass_production(self):
         """Setup printer for mass production: Z+15, A+90, B-45"""
         if not self.printer_controller:
-            QMessageBox.warning(self, "Not Connected", "Please test printer connection first.")
+            self.show_warning("Not Connected", "Please test printer connection first.")
             return
             
         # Confirm before executing
@@ -959,51 +1213,23 @@ class GCodeProcessorGUI(QMainWindow):
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setRange(0, 0)
-            self.log_output.append("🏭 Executing mass production setup sequence...")
+            self.show_progress()
+            self.log("🏭 Executing mass production setup sequence...")
             
-            try:
-                # Execute sequence step by step
-                commands = [
-                    "G91",  # Relative positioning
-                    "G1 Z15 F1000",  # Move Z up 15mm
-                    "G90",  # Absolute positioning
-                    "MANUAL_STEPPER STEPPER=a_stepper MOVE=90",  # A axis to 90°
-                    "MANUAL_STEPPER STEPPER=b_stepper MOVE=-45"  # B axis to -45°
-                ]
-                
-                success_count = 0
-                for i, command in enumerate(commands):
-                    result = self.printer_controller.send_gcode(command)
-                    if result["success"]:
-                        success_count += 1
-                        self.log_output.append(f"✅ Step {i+1}/5: {command}")
-                    else:
-                        self.log_output.append(f"❌ Step {i+1}/5 failed: {command} - {result['error']}")
-                        break
-                
-                self.progress_bar.setVisible(False)
-                
-                if success_count == len(commands):
-                    QMessageBox.information(self, "Setup Complete", 
-                                          "Mass production setup completed successfully!\n"
-                                          "Printer is ready for mass production mode.")
-                    self.log_output.append("🏭 ✅ Mass production setup completed successfully!")
-                else:
-                    QMessageBox.warning(self, "Setup Incomplete", 
-                                      f"Setup partially completed ({success_count}/{len(commands)} steps).\n"
-                                      "Check process log for details.")
-                    
-            except Exception as e:
-                self.progress_bar.setVisible(False)
-                QMessageBox.critical(self, "Setup Error", f"An error occurred: {str(e)}")
-                self.log_output.append(f"❌ Mass production setup error: {str(e)}")
+            # Setup sequence
+            commands = [
+                "G91",  # Relative positioning
+                "G1 Z15 F1000",  # Move Z up 15mm
+                "G90",  # Absolute positioning
+                "MANUAL_STEPPER STEPPER=a_stepper MOVE=90",  # A axis to 90°
+                "MANUAL_STEPPER STEPPER=b_stepper MOVE=-45"  # B axis to -45°
+            ]
+            self.run_setup_sequence(commands, "Mass production", "🏭")
 
     def setup_five_axis(self):
         """Setup printer for 5-axis printing: Z+25, B-90"""
         if not self.printer_controller:
-            QMessageBox.warning(self, "Not Connected", "Please test printer connection first.")
+            self.show_warning("Not Connected", "Please test printer connection first.")
             return
             
         # Confirm before executing
@@ -1015,50 +1241,45 @@ class GCodeProcessorGUI(QMainWindow):
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setRange(0, 0)
-            self.log_output.append("🔧 Executing 5-axis printing setup sequence...")
+            self.show_progress()
+            self.log("🔧 Executing 5-axis printing setup sequence...")
             
-            try:
-                # Execute sequence step by step
-                commands = [
-                    "G91",  # Relative positioning
-                    "G1 Z25 F1000",  # Move Z up 25mm
-                    "G90",  # Absolute positioning
-                    "MANUAL_STEPPER STEPPER=b_stepper MOVE=-90"  # B axis to -90°
-                ]
-                
-                success_count = 0
-                for i, command in enumerate(commands):
-                    result = self.printer_controller.send_gcode(command)
-                    if result["success"]:
-                        success_count += 1
-                        self.log_output.append(f"✅ Step {i+1}/4: {command}")
-                    else:
-                        self.log_output.append(f"❌ Step {i+1}/4 failed: {command} - {result['error']}")
-                        break
-                
-                self.progress_bar.setVisible(False)
-                
-                if success_count == len(commands):
-                    QMessageBox.information(self, "Setup Complete", 
-                                          "5-axis printing setup completed successfully!\n"
-                                          "Printer is ready for 5-axis printing mode.")
-                    self.log_output.append("🔧 ✅ 5-axis printing setup completed successfully!")
-                else:
-                    QMessageBox.warning(self, "Setup Incomplete", 
-                                      f"Setup partially completed ({success_count}/{len(commands)} steps).\n"
-                                      "Check process log for details.")
-                    
-            except Exception as e:
-                self.progress_bar.setVisible(False)
-                QMessageBox.critical(self, "Setup Error", f"An error occurred: {str(e)}")
-                self.log_output.append(f"❌ 5-axis setup error: {str(e)}")
+            # Setup sequence
+            commands = [
+                "G91",  # Relative positioning
+                "G1 Z25 F1000",  # Move Z up 25mm
+                "G90",  # Absolute positioning
+                "MANUAL_STEPPER STEPPER=b_stepper MOVE=-90"  # B axis to -90°
+            ]
+            self.run_setup_sequence(commands, "5-axis printing", "🔧")
+
+    def run_setup_sequence(self, commands, name, icon):
+        """Send a setup sequence to the printer as one script on the thread pool"""
+        # Klipper stops at the first failing command, and Moonraker only answers once
+        # every move of the script is done, hence the long timeout
+        send = functools.partial(self.printer_controller.send_gcode, "\n".join(commands),
+                                 timeout=SETUP_SCRIPT_TIMEOUT)
+        self.start_printer_task(lambda result: self.on_setup_finished(result, commands, name, icon), send)
+
+    def on_setup_finished(self, result, commands, name, icon):
+        self.finish_printer_task()
+        if result["success"]:
+            for i, command in enumerate(commands):
+                self.log(f"✅ Step {i+1}/{len(commands)}: {command}")
+            self.show_info("Setup Complete", 
+                         f"{name} setup completed successfully!\n"
+                         f"Printer is ready for {name.lower()} mode.")
+            self.log(f"{icon} ✅ {name} setup completed successfully!")
+        else:
+            self.log(f"❌ Setup sequence failed: {result['error']}")
+            self.show_warning("Setup Incomplete", 
+                            "Setup sequence failed, the remaining steps were not executed.\n"
+                            "Check process log for details.")
 
     def home_all_axes(self):
         """Home all printer axes"""
         if not self.printer_controller:
-            QMessageBox.warning(self, "Not Connected", "Please test printer connection first.")
+            self.show_warning("Not Connected", "Please test printer connection first.")
             return
             
         # Confirm before executing
@@ -1068,40 +1289,40 @@ class GCodeProcessorGUI(QMainWindow):
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.log_output.append("🏠 Homing all axes...")
+            self.log("🏠 Homing all axes...")
             
             try:
                 result = self.printer_controller.home_all_axes()
                 if result["success"]:
-                    QMessageBox.information(self, "Homing Complete", "All axes homed successfully!")
-                    self.log_output.append("🏠 ✅ All axes homed successfully!")
+                    self.show_info("Homing Complete", "All axes homed successfully!")
+                    self.log("🏠 ✅ All axes homed successfully!")
                 else:
-                    QMessageBox.critical(self, "Homing Failed", f"Homing failed: {result['error']}")
-                    self.log_output.append(f"❌ Homing failed: {result['error']}")
+                    self.show_error("Homing Failed", f"Homing failed: {result['error']}")
+                    self.log(f"❌ Homing failed: {result['error']}")
             except Exception as e:
-                QMessageBox.critical(self, "Homing Error", f"An error occurred: {str(e)}")
-                self.log_output.append(f"❌ Homing error: {str(e)}")
+                self.show_error("Homing Error", f"An error occurred: {str(e)}")
+                self.log(f"❌ Homing error: {str(e)}")
 
     def emergency_stop(self):
         """Emergency stop the printer"""
         if not self.printer_controller:
-            QMessageBox.warning(self, "Not Connected", "Please test printer connection first.")
+            self.show_warning("Not Connected", "Please test printer connection first.")
             return
             
         # No confirmation for emergency stop - it should be immediate
-        self.log_output.append("🛑 EMERGENCY STOP ACTIVATED!")
+        self.log("🛑 EMERGENCY STOP ACTIVATED!")
         
         try:
             result = self.printer_controller.emergency_stop()
             if result["success"]:
-                QMessageBox.critical(self, "Emergency Stop", "Emergency stop executed!\nPrinter has been stopped.")
-                self.log_output.append("🛑 ✅ Emergency stop executed successfully!")
+                self.show_error("Emergency Stop", "Emergency stop executed!\nPrinter has been stopped.")
+                self.log("🛑 ✅ Emergency stop executed successfully!")
             else:
-                QMessageBox.critical(self, "Emergency Stop Failed", f"Emergency stop failed: {result['error']}")
-                self.log_output.append(f"❌ Emergency stop failed: {result['error']}")
+                self.show_error("Emergency Stop Failed", f"Emergency stop failed: {result['error']}")
+                self.log(f"❌ Emergency stop failed: {result['error']}")
         except Exception as e:
-            QMessageBox.critical(self, "Emergency Stop Error", f"An error occurred: {str(e)}")
-            self.log_output.append(f"❌ Emergency stop error: {str(e)}")
+            self.show_error("Emergency Stop Error", f"An error occurred: {str(e)}")
+            self.log(f"❌ Emergency stop error: {str(e)}")
 
 def main():
     app = QApplication(sys.argv)
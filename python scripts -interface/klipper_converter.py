@@ -1,39 +1,53 @@
 import re
 
-def convert_b_axis_to_manual_stepper(input_path, output_path):
+# B value of a G1 line, and the B and A words to strip from it (matched on raw bytes)
+_B_RE = re.compile(rb"\bB(-?\d+\.?\d*)")
+_B_STRIP_RE = re.compile(rb"\s*B-?\d+\.?\d*")
+_A_STRIP_RE = re.compile(rb"\s*A-?\d+\.?\d*")
+_MANUAL = b"MANUAL_STEPPER STEPPER=b_stepper MOVE="
+
+def convert_lines(lines):
     """
-    Convert B-axis values in G-code to Klipper-compatible MANUAL_STEPPER commands.
-    Removes A values and redundant B-moves.
+    Convert an iterable of raw G-code lines (bytes), yielding the Klipper-compatible lines.
+    B-axis values become MANUAL_STEPPER commands, A values and redundant B-moves are removed.
     """
-    with open(input_path, 'r', encoding='utf-8', errors='ignore') as infile:
-        lines = infile.readlines()
-
-    converted_lines = []
-    last_b_value = None
+    last_b_text = last_b_value = None
 
     for line in lines:
-        original_line = line.strip()
-
         # Only modify G1 movement lines
-        if original_line.startswith("G1"):
+        if line.startswith(b"G1"):
+            original_line = line.rstrip()
+
             # Extract B-axis value if it exists
-            b_match = re.search(r"\bB(-?\d+\.?\d*)", original_line)
+            b_match = _B_RE.search(original_line)
             if b_match:
-                current_b = float(b_match.group(1))
-                if last_b_value is None or current_b != last_b_value:
-                    converted_lines.append(f"MANUAL_STEPPER STEPPER=b_stepper MOVE={current_b}")
-                    last_b_value = current_b
+                # Identical B text needs no float parse, other spellings (B12.500 / B12.5)
+                # are compared by value and the move keeps the text as written
+                b_text = b_match.group(1)
+                if b_text != last_b_text:
+                    current_b = float(b_text)
+                    if current_b != last_b_value:
+                        yield _MANUAL + b_text + b"\n"
+                        last_b_value = current_b
+                    last_b_text = b_text
                 # Remove B from the G1 line
-                original_line = re.sub(r"\s*B-?\d+\.?\d*", "", original_line)
+                original_line = _B_STRIP_RE.sub(b"", original_line)
 
             # Remove A (e.g., A0)
-            original_line = re.sub(r"\s*A-?\d+\.?\d*", "", original_line)
+            original_line = _A_STRIP_RE.sub(b"", original_line)
+            yield original_line + b"\n"
+        else:
+            # Every other line already ends with its own newline
+            yield line
 
-        converted_lines.append(original_line)
-
-    # Write cleaned output to a file
-    with open(output_path, 'w', encoding='utf-8') as outfile:
-        outfile.write("\n".join(converted_lines))
+def convert_b_axis_to_manual_stepper(input_path, output_path):
+    """
+    Convert B-axis values in G-code to Klipper-compatible MANUAL_STEPPER commands.
+    Removes A values and redundant B-moves.
+    """
+    # Stream the raw lines straight through a 1 MiB output buffer, no decoding needed
+    with open(input_path, 'rb') as infile, open(output_path, 'wb', buffering=1 << 20) as outfile:
+        outfile.writelines(convert_lines(infile))
 
     print(f"✅ Done! Converted file saved to: {output_path}")
 
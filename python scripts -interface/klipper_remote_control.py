@@ -3,6 +3,13 @@ import json
 import os
 from typing import Optional, Dict, Any
 
+# requests-toolbelt is optional: it streams uploads instead of building the whole multipart body in memory
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+    TOOLBELT_AVAILABLE = True
+except ImportError:
+    TOOLBELT_AVAILABLE = False
+
 class KlipperRemoteController:
     """
     Remote controller for Klipper via Moonraker API
@@ -12,52 +19,75 @@ class KlipperRemoteController:
         self.host = host
         self.port = port
         self.base_url = f"http://{host}:{port}"
+        # One session for all requests so the connection to Moonraker is kept alive
+        self.session = requests.Session()
+    
+    def close(self):
+        """Close the HTTP session and its pooled connections"""
+        self.session.close()
         
     def test_connection(self) -> bool:
         """Test if Klipper/Moonraker is accessible"""
         try:
-            response = requests.get(f"{self.base_url}/server/info", timeout=5)
+            response = self.session.get(f"{self.base_url}/server/info", timeout=5)
             return response.status_code == 200
         except requests.RequestException:
             return False
     
-    def send_gcode(self, gcode_command: str) -> Dict[str, Any]:
-        """Send a single G-code command to Klipper"""
+    def _result(self, response, parse_json: bool) -> Dict[str, Any]:
+        """Success result for a response, with its decoded JSON body only if asked for"""
+        if parse_json:
+            return {"success": True, "response": response.json()}
+        return {"success": True}
+    
+    def send_gcode(self, gcode_command: str, parse_json: bool = False, timeout: float = 10) -> Dict[str, Any]:
+        """Send a G-code command (or several, newline separated) to Klipper.
+
+        Moonraker only answers once the whole script has run, so scripts with long
+        moves need a larger timeout.
+        """
         try:
             url = f"{self.base_url}/printer/gcode/script"
             data = {"script": gcode_command}
-            response = requests.post(url, json=data, timeout=10)
+            response = self.session.post(url, json=data, timeout=timeout)
             response.raise_for_status()
-            return {"success": True, "response": response.json()}
+            return self._result(response, parse_json)
         except requests.RequestException as e:
             return {"success": False, "error": str(e)}
     
-    def upload_file(self, file_path: str, target_folder: str = "gcodes") -> Dict[str, Any]:
+    def upload_file(self, file_path: str, target_folder: str = "gcodes", parse_json: bool = False) -> Dict[str, Any]:
         """Upload a G-code file to Klipper"""
         try:
             if not os.path.exists(file_path):
                 return {"success": False, "error": "File not found"}
             
             with open(file_path, 'rb') as f:
-                files = {'file': (os.path.basename(file_path), f, 'text/plain')}
-                data = {'root': target_folder}
-                
                 url = f"{self.base_url}/server/files/upload"
-                response = requests.post(url, files=files, data=data, timeout=30)
+                if TOOLBELT_AVAILABLE:
+                    encoder = MultipartEncoder(fields={
+                        'root': target_folder,
+                        'file': (os.path.basename(file_path), f, 'text/plain')
+                    })
+                    response = self.session.post(url, data=encoder, timeout=30,
+                                                 headers={'Content-Type': encoder.content_type})
+                else:
+                    files = {'file': (os.path.basename(file_path), f, 'text/plain')}
+                    data = {'root': target_folder}
+                    response = self.session.post(url, files=files, data=data, timeout=30)
                 response.raise_for_status()
                 
-                return {"success": True, "response": response.json()}
+                return self._result(response, parse_json)
         except requests.RequestException as e:
             return {"success": False, "error": str(e)}
     
-    def start_print(self, filename: str) -> Dict[str, Any]:
+    def start_print(self, filename: str, parse_json: bool = False) -> Dict[str, Any]:
         """Start printing a file"""
         try:
             url = f"{self.base_url}/printer/print/start"
             data = {"filename": filename}
-            response = requests.post(url, json=data, timeout=10)
+            response = self.session.post(url, json=data, timeout=10)
             response.raise_for_status()
-            return {"success": True, "response": response.json()}
+            return self._result(response, parse_json)
         except requests.RequestException as e:
             return {"success": False, "error": str(e)}
     
@@ -68,12 +98,8 @@ class KlipperRemoteController:
         if not upload_result["success"]:
             return upload_result
         
-        # Extract filename from upload response
-        try:
-            filename = upload_result["response"]["item"]["path"]
-            return self.start_print(filename)
-        except KeyError:
-            return {"success": False, "error": "Could not determine uploaded filename"}
+        # The file is stored under its own name in the gcodes root, no need to read it back from the response
+        return self.start_print(os.path.basename(file_path))
     
     def get_printer_status(self) -> Dict[str, Any]:
         """Get current printer status"""
@@ -84,7 +110,7 @@ class KlipperRemoteController:
                 "toolhead": None,
                 "extruder": None
             }
-            response = requests.get(url, params=params, timeout=5)
+            response = self.session.get(url, params=params, timeout=5)
             response.raise_for_status()
             return {"success": True, "status": response.json()}
         except requests.RequestException as e:
@@ -0,0 +1,16 @@
+"""
+Build the optional Cython bending kernel in place:
+    python setup.py build_ext --inplace
+Only needed when numba is not installed.
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="bend_kernels_cy",
+    ext_modules=cythonize(
+        "bend_kernels_cy.pyx",
+        compiler_directives={'boundscheck': False, 'wraparound': False, 'cdivision': True},
+    ),
+)